@@ -1,13 +1,28 @@
 # 内置模块（优先导入）
+import copy
 import datetime
+import functools
+import io
 import os
 import re
+import bisect
 import getpass
+from concurrent.futures import ThreadPoolExecutor
+from xml.sax.saxutils import escape
+from itertools import accumulate
+from operator import itemgetter
 
 # 第三方核心模块
 import yaml
+from lxml import etree
 import pytz
+try:
+    # 优先使用libyaml的C实现，未编译libyaml时回退到纯Python实现
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
 from docx import Document
+from docx.enum.style import WD_STYLE_TYPE
 from docx.enum.table import WD_ALIGN_VERTICAL
 from docx.enum.text import (
     WD_ALIGN_PARAGRAPH,
@@ -15,18 +30,39 @@ from docx.enum.text import (
     WD_PARAGRAPH_ALIGNMENT,
     WD_TAB_ALIGNMENT
 )
-from docx.oxml.ns import qn
+from docx.oxml import OxmlElement, parse_xml
+from docx.oxml.ns import nsdecls, qn
 from docx.oxml.shared import qn  # 保留（docx不同子模块的qn实际是同一个对象，无需删除）
-from docx.shared import Inches, Pt, RGBColor
-
-# 业务相关第三方模块
-from uptime_kuma_api import UptimeKumaApi, UptimeKumaException
-
+from docx.shared import Emu, Inches, Pt, RGBColor
 
 
 # --- 基础配置 ---
 __version__ = "2.0.0"
 CONFIG_FILE = "config.yml"
+# 并发请求Uptime Kuma的最大线程数
+MAX_FETCH_WORKERS = 16
+# 单次Uptime Kuma请求的超时秒数（库默认10秒）：并发的心跳查询在服务端共用一个数据库排队执行，
+# 季报/年报时靠后的请求需等待前面的查询完成，按默认值会误判超时
+API_TIMEOUT = 120
+# 心跳消息中 [关键词] 的提取正则（模块级预编译，避免逐条心跳重复查找缓存）
+KEYWORD_RE = re.compile(r"\[([^\]]*)\]")
+# 报告统计所用时区（模块级创建一次，避免每次调用重复查找pytz时区）
+_TZ_SH = pytz.timezone("Asia/Shanghai")
+# 各时间维度「第一天」0时0分的计算方式
+_PERIOD_STARTS = {
+    # 本日：当前日期的0时0分
+    "day": lambda n: n.replace(hour=0, minute=0, second=0, microsecond=0),
+    # 本周：周一的0时0分
+    "week": lambda n: (n - datetime.timedelta(days=n.weekday())).replace(hour=0, minute=0, second=0, microsecond=0),
+    # 本月：当月1号的0时0分
+    "month": lambda n: n.replace(day=1, hour=0, minute=0, second=0, microsecond=0),
+    # 本季度：季度第一天（1/4/7/10月1号）的0时0分
+    "quarter": lambda n: n.replace(month=((n.month - 1) // 3) * 3 + 1, day=1, hour=0, minute=0, second=0, microsecond=0),
+    # 本年：1月1号的0时0分
+    "year": lambda n: n.replace(month=1, day=1, hour=0, minute=0, second=0, microsecond=0),
+}
+# 配置文件解析缓存：{路径: ((st_mtime_ns, st_size), 解析结果)}，文件变化后自动失效
+_CFG_CACHE = {}
 
 # --- 启动横幅 ---
 def print_banner():
@@ -49,20 +85,28 @@ def load_config():
     if not os.path.exists(CONFIG_FILE):
         return None, None, None,None
     try:
-        with open(CONFIG_FILE, 'r') as f:
-            config = yaml.safe_load(f)
-            if config and 'url' in config and 'username' in config:
-                url = config['url']
-                username = config['username']
-                Company= config['Company']
-                Company_English_name  = config['Company_English_name']
-
-
-                print(f"从 {CONFIG_FILE} 加载配置成功。")
-                return url, username, Company,Company_English_name
-            else:
-                print(f"配置文件格式错误，将提示输入新值。")
-                return None, None, None, None
+        # 文件修改时间与大小未变则直接复用上次的解析结果，跳过YAML解析
+        stat = os.stat(CONFIG_FILE)
+        key = (stat.st_mtime_ns, stat.st_size)
+        ent = _CFG_CACHE.get(CONFIG_FILE)
+        if ent and ent[0] == key:
+            config = copy.deepcopy(ent[1])
+        else:
+            with open(CONFIG_FILE, 'r') as f:
+                config = yaml.load(f, Loader=_Loader)
+            _CFG_CACHE[CONFIG_FILE] = (key, copy.deepcopy(config))
+        if config and 'url' in config and 'username' in config:
+            url = config['url']
+            username = config['username']
+            Company= config['Company']
+            Company_English_name  = config['Company_English_name']
+
+
+            print(f"从 {CONFIG_FILE} 加载配置成功。")
+            return url, username, Company,Company_English_name
+        else:
+            print(f"配置文件格式错误，将提示输入新值。")
+            return None, None, None, None
     except (yaml.YAMLError, IOError) as e:
         print(f"读取配置文件失败: {e}，将提示输入新值。")
         return None, None, None,None
@@ -72,7 +116,7 @@ def save_config(url, username,Company,Company_English_name):
     config_data = {'url': url, 'username': username,'Company': Company , 'Company_English_name' : Company_English_name}
     try:
         with open(CONFIG_FILE, 'w') as f:
-            yaml.dump(config_data, f, default_flow_style=False)
+            yaml.dump(config_data, f, Dumper=_Dumper, default_flow_style=False)
         print(f"配置已保存到 {CONFIG_FILE}，下次可直接使用。")
     except IOError as e:
         print(f"保存配置失败: {e}")
@@ -80,20 +124,53 @@ def save_config(url, username,Company,Company_English_name):
 def handle_credentials():
     """处理登录凭证（加载配置或手动输入）"""
     url, username, Company, Company_English_name  = load_config()
-    save_needed = not all([url, username, Company, Company_English_name])
+    # 仅当有字段需要手动输入时才回写配置文件，全部来自配置文件时跳过保存
+    save_needed = False
 
     if not url:
         url = input("输入Uptime Kuma地址 (例如: http://localhost:3001): ")
+        save_needed = True
     if not username:
         username = input("输入Uptime Kuma用户名: ")
+        save_needed = True
     if not Company:
         Company = input("输入公司名称: ") or '网站监测项目组'
+        save_needed = True
     if not Company_English_name:
         Company_English_name = input("输入公司英文名称，例如（Suzhou Hs Cybersecurity Technology Co., Ltd.): ") or 'Website Monitoring Project Team'
+        save_needed = True
     password = getpass.getpass(f"输入{username}的密码: ")
     return url, username, password,Company, Company_English_name,save_needed
 
 # --- 工具函数 ---
+def _fast_parse_utc(s):
+    """按固定格式 '%Y-%m-%d %H:%M:%S' 手动切片解析UTC时间（比strptime快数倍）"""
+    return datetime.datetime(int(s[0:4]), int(s[5:7]), int(s[8:10]),
+                             int(s[11:13]), int(s[14:16]), int(s[17:19]), tzinfo=pytz.utc)
+
+
+def _detect_runs(down_flags):
+    """
+    单次扫描停机标记序列，返回停机区间的起止下标
+
+    报告耗时主要在Uptime Kuma网络请求与Word文档生成上，单个监控项的心跳量仅数千条，
+    此处保持纯Python实现，不引入Numba：其JIT编译开销会超过这段循环本身的耗时
+
+    :param down_flags: 按时间排序的停机标记可迭代对象（True=停机），可直接传入生成器
+    :return: (starts, ends)；ends比starts少一个时，表示最后一次停机仍在持续
+    """
+    starts = []
+    ends = []
+    run_start = -1
+    for i, is_down in enumerate(down_flags):
+        if is_down:
+            if run_start < 0:
+                run_start = i
+                starts.append(i)
+        elif run_start >= 0:
+            ends.append(i)
+            run_start = -1
+    return starts, ends
 
 
 def chose_report():
@@ -136,162 +213,121 @@ def chose_report():
 
 def calculate_hours_since_period_start(period) :
     """
-    计算指定时间维度的第一天距离当前时间的小时数（保留2位小数）
+    计算指定时间维度的第一天距离当前时间的小时数（四舍五入取整）
     
-    :return: 距离当前时间的小时数（正数，保留2位小数）
-    :raises ValueError: 无效的period/时区/周起始日
-    :raises Exception: 其他时间计算异常
+    :return: (hours, period_start)；hours为距离当前时间的小时数（正整数），供按小时回溯的接口使用，
+             period_start为该时间维度第一天0时0分的精确时间（带时区），作为报告的真实起点
+    :raises ValueError: 无效的period
     """
-    
-    
-    
     # 1. 校验入参合法性
-    valid_periods = ["day", "week", "month", "quarter", "year"]
-    if period.lower() not in valid_periods:
-        raise ValueError(f"无效的period！仅支持：{', '.join(valid_periods)}")
-    
-    
-    
-    try:
-        # 2. 初始化时区对象
-        timezone = "Asia/Shanghai"
-        tz = pytz.timezone(timezone)
-    except pytz.UnknownTimeZoneError:
-        raise ValueError(f"无效的时区：{timezone}，可选值参考pytz.all_timezones")
-    
-    # 3. 获取当前带时区的时间（精确到秒）
-    now = datetime.datetime.now(tz).replace(second=0, microsecond=0)
-    
-    # 4. 根据不同period计算「第一天」的0时0分0秒
-    period_start = None
-
-    
-    if period.lower() == "day":
-        # 本日：当前日期的0时0分0秒
-        period_start = now.replace(hour=0, minute=0)
-
-    
-    elif period.lower() == "week":
-        # 本周：周起始日的0时0分0秒（默认周一）
-        current_weekday = now.weekday()  # 0=周一，6=周日
-        # 计算距离周起始日的天数差
-        day_diff = (current_weekday ) % 7
-        period_start = (now - datetime.timedelta(days=day_diff)).replace(hour=0, minute=0)
-
-    
-    elif period.lower() == "month":
-        # 本月：当月1号的0时0分0秒
-        period_start = now.replace(day=1, hour=0, minute=0)
-
-    
-    elif period.lower() == "quarter":
-        # 本季度：季度第一天（1/4/7/10月1号）的0时0分0秒
-        # 计算当前季度的起始月份：(当前月-1)//3 *3 +1
-        quarter_start_month = ((now.month - 1) // 3) * 3 + 1
-        period_start = now.replace(month=quarter_start_month, day=1, hour=0, minute=0)
+    p = period.lower()
+    if p not in _PERIOD_STARTS:
+        raise ValueError(f"无效的period！仅支持：{', '.join(_PERIOD_STARTS)}")
 
-    
-    elif period.lower() == "year":
-        # 本年：1月1号的0时0分0秒
-        period_start = now.replace(month=1, day=1, hour=0, minute=0)
+    # 2. 获取当前带时区的时间，并计算「第一天」的0时0分
+    now = datetime.datetime.now(_TZ_SH)
+    period_start = _PERIOD_STARTS[p](now)
 
-    
-    # 5. 计算时间差并转换为小时数（不保留小数）
-    if period_start != None:
-        time_diff = now - period_start
-        hours_diff = round(time_diff.total_seconds() / 3600, )  
-    return hours_diff
+    # 3. 计算时间差并转换为小时数（不保留小数）
+    return round((now - period_start).total_seconds() / 3600), period_start
 
 
 # --- 数据处理 ---
-def analyze_heartbeats(heartbeats):
-    """分析心跳数据，计算停机事件和延迟数据"""
-  
+def analyze_heartbeats(heartbeats, since=None):
+    """
+    分析心跳数据，计算停机事件和延迟数据
+
+    :param heartbeats: Uptime Kuma返回的心跳列表
+    :param since: 报告起始时间（带时区）；早于该时间的心跳直接跳过，不参与任何统计
+    """
     user_tz = pytz.utc
 
     def to_datetime(time_val):
-        """转换时间为带时区的datetime对象"""
+        """转换时间为带时区的datetime对象（user_tz即UTC，无需再astimezone）"""
         if isinstance(time_val, str):
             try:
-                naive_dt = datetime.datetime.strptime(time_val.split('.')[0], '%Y-%m-%d %H:%M:%S')
-                return pytz.utc.localize(naive_dt).astimezone(user_tz)
+                s = time_val if '.' not in time_val else time_val[:time_val.index('.')]
+                return _fast_parse_utc(s)
             except ValueError:
                 return None
         elif isinstance(time_val, (int, float)):
-            return datetime.datetime.fromtimestamp(float(time_val), tz=pytz.utc).astimezone(user_tz)
+            return datetime.datetime.fromtimestamp(float(time_val), tz=user_tz)
         return None
 
     processed_beats = []
     ping_data = []
-    keywords = []
+    unique_keywords_set = set()
     keywords_count=0
     count=0
 
 
     # print(heartbeats[0])
     for beat in heartbeats:
+        dt = to_datetime(beat.get('time'))
+        if since is not None and dt is not None and dt < since:
+            continue
         count+=1
-        msg = beat['msg']
-        if 'but' in msg:
-           
-            pattern = r"\[(.*?)\]"
-            match = re.search(pattern, msg)
+        # 部分心跳类型的msg可能为None；先用C实现的子串判断过滤，仅必要时才进入正则
+        msg = beat.get('msg') or ''
+        if 'but' in msg and '[' in msg:
+            match = KEYWORD_RE.search(msg)
             if match:
                 
                 results = match.group(1)
                 if results != "":
-                    for i in results:
-                        keywords.append(results)
+                    unique_keywords_set.add(results)
                     keywords_count+=1
-                    
-                    
-        dt = to_datetime(beat.get('time'))
+
         if dt:
-            processed_beats.append({'datetime': dt, 'status': beat['status']})
+            processed_beats.append((dt, beat['status']))
             if beat.get('ping') is not None:
-                ping_data.append({'datetime': dt, 'ping': beat['ping']})
+                ping_data.append((dt, beat['ping']))
     # print(list(set(keywords)))
     # print(keywords_count)
     #  计算关键词占比
-    unique_keywords = list(set(keywords))
+    unique_keywords = list(unique_keywords_set)
     keyword_ratio = (keywords_count / count * 100) if count > 0 else 0.0
-    # 统计每个关键词出现次数
-   
-    beats = sorted(processed_beats, key=lambda x: x['datetime'])
-    incidents = []
-    current_downtime_start_dt = None
+    # 按时间排序（停机区间检测依赖时间顺序）
+    beats = sorted(processed_beats, key=itemgetter(0))
+    # 延迟数据同样按时间排序，并拆分为时间列、延迟列供汇总统计按时间窗口二分切片
+    ping_data.sort(key=itemgetter(0))
+    ping_times = [p[0] for p in ping_data]
+    pings = [p[1] for p in ping_data]
 
     keyword_analysis = {
         "unique_keywords": unique_keywords,
         "keyword_count": keywords_count,
-        "keyword_ratio": round(keyword_ratio, 2)   
+        "keyword_ratio": round(keyword_ratio, 2)
     }
 
-    # 识别停机事件
-    for beat in beats:
-        is_down = beat['status'] == 0
-        if is_down and current_downtime_start_dt is None:
-            current_downtime_start_dt = beat['datetime']
-        elif not is_down and current_downtime_start_dt is not None:
-            incidents.append({
-                "start": current_downtime_start_dt,
-                "duration": beat['datetime'] - current_downtime_start_dt
-            })
-            current_downtime_start_dt = None
+    # 识别停机事件：停机标记发生变化的位置即为停机开始/恢复的边界；
+    # 停机标记以生成器传入，不为全部心跳建立中间列表，仅为停机事件本身创建对象
+    starts, ends = _detect_runs(b[1] == 0 for b in beats)
+    incidents = [
+        {"start": beats[start_idx][0], "duration": beats[end_idx][0] - beats[start_idx][0]}
+        for start_idx, end_idx in zip(starts, ends)
+    ]
 
     # 处理持续中的停机
-    if current_downtime_start_dt is not None:
+    if len(starts) > len(ends):
+        start_dt = beats[starts[-1]][0]
         now_aware = datetime.datetime.now(user_tz)
-        incidents.append({"start": current_downtime_start_dt, "duration": now_aware - current_downtime_start_dt, "ongoing": True})
+        incidents.append({"start": start_dt, "duration": now_aware - start_dt, "ongoing": True})
     # print(keyword_analysis)
-    return {"downtime_incidents": incidents,"keyword_analysis":keyword_analysis, "ping_data": ping_data}
+    return {"downtime_incidents": incidents,"keyword_analysis":keyword_analysis,
+            "ping_times": ping_times, "pings": pings}
 
 def calculate_summary_stats(analysis_results):
     """计算日/周/月维度的汇总统计"""
     incidents = analysis_results['downtime_incidents']
-    ping_data = analysis_results['ping_data']
+    ping_times = analysis_results['ping_times']
+    pings = analysis_results['pings']
+
+    # 停机事件与延迟数据均已按时间排序：预先提取时间列用于二分查找，
+    # 并对停机时长做前缀和，三个统计维度共享同一次扫描
+    incident_starts = [inc['start'] for inc in incidents]
+    duration_prefix = list(accumulate((inc['duration'] for inc in incidents), initial=datetime.timedelta()))
 
-    
     user_tz = pytz.utc
 
     now = datetime.datetime.now(user_tz)
@@ -302,20 +338,32 @@ def calculate_summary_stats(analysis_results):
     }
 
     summary = {}
+    # 延迟累计量：各维度窗口按日→周→月由近及远嵌套，只需从末尾向前扩展一次
+    n = 0
+    total = 0
+    mx = None
+    pos = len(pings)
     for name, delta in periods.items():
         period_start = now - delta
 
         # 停机统计
-        period_incidents = [inc for inc in incidents if inc['start'] >= period_start]
-        count = len(period_incidents)
-        total_duration = sum([inc['duration'] for inc in period_incidents], datetime.timedelta())
+        idx = bisect.bisect_left(incident_starts, period_start)
+        count = len(incidents) - idx
+        total_duration = duration_prefix[-1] - duration_prefix[idx]
         avg_duration = total_duration / count if count > 0 else datetime.timedelta(0)
         percentage = (total_duration.total_seconds() / delta.total_seconds()) * 100 if delta.total_seconds() > 0 else 0
 
-        # 延迟统计
-        period_pings = [p['ping'] for p in ping_data if p['datetime'] >= period_start]
-        avg_ping = sum(period_pings) / len(period_pings) if period_pings else None
-        max_ping = max(period_pings) if period_pings else None
+        # 延迟统计（单次遍历同时累计条数、总和、最大值，不生成中间列表）
+        lo = bisect.bisect_left(ping_times, period_start, 0, pos)
+        for i in range(lo, pos):
+            v = pings[i]
+            n += 1
+            total += v
+            if mx is None or v > mx:
+                mx = v
+        pos = lo
+        avg_ping = total / n if n else None
+        max_ping = mx if n else None
 
         summary[name] = {
             "count": count,
@@ -338,7 +386,7 @@ def select_monitors(monitors):
     """
 
     valid_display_ids = []  # 存储有效的显示编号（用户看到的ID）
-    display_mapping = {} 
+    display_mapping = {}  # 显示编号 -> 对应的监控项ID元组（监控组为组ID+全部子监控ID）
 
     print("\n📋 可用监控项:")
     for monitor in monitors:
@@ -349,19 +397,12 @@ def select_monitors(monitors):
             ID = monitor["id"]
             if monitor.get("childrenIDs", []) != []:   
                 print(f"ID: {ID},监控组: {pathName}")
-                display_mapping[ID] = monitor["childrenIDs"]
+                display_mapping[ID] = (ID, *monitor["childrenIDs"])
             else:
                 print(f"ID: {ID},单独监控: {pathName}")
-                display_mapping[ID] = ID
+                display_mapping[ID] = (ID,)
             valid_display_ids.append(ID)
 
-    if valid_display_ids is None:
-        for monitor in monitors:
-            pathName=monitor["pathName"]
-            ID = monitor["id"]
-            print(f"ID: {ID},子监控: {pathName}")
-            valid_display_ids.append(ID)
-            display_mapping[ID] = ID
     # print(display_mapping)
     # 4. 用户输入选择（循环直到输入有效）
     prompt = f"\n请输入监控项编号（有效编号：{valid_display_ids}），多个编号用逗号分隔,监控组建议只选一个："
@@ -380,24 +421,16 @@ def select_monitors(monitors):
             selected_display_ids.sort()  # 排序
             
             # 验证编号是否有效
-            invalid_ids = [sid for sid in selected_display_ids if sid not in valid_display_ids]
+            invalid_ids = [sid for sid in selected_display_ids if sid not in display_mapping]
             if invalid_ids:
                 print(f"❌ 无效编号：{invalid_ids}，有效编号范围：{valid_display_ids}，请重新输入！")
                 continue
             # 初始化空列表，用于存储选中项对应的原监控项列表索引
             selected_list_indices = []
 
-            # 遍历用户选中的显示编号（已去重+排序）
+            # 遍历用户选中的显示编号（已去重+排序），展开为对应的监控项ID
             for sid in selected_display_ids:
-                # 从映射字典中获取该显示编号对应的原列表索引
-                original_index = display_mapping[sid]
-                if type(original_index) == list:
-                    selected_list_indices.append(sid)
-                    for i in original_index:
-                        selected_list_indices.append(i)
-                else:
-                    # 将索引追加到列表中
-                    selected_list_indices.append(original_index)
+                selected_list_indices.extend(display_mapping[sid])
             return selected_list_indices
 
             
@@ -408,47 +441,245 @@ def select_monitors(monitors):
             print(f"❌ 输入处理出错：{str(e)}，请重新输入！")
 
 
-# --- Word报告生成核心函数 ---
-def generate_docx_report(project_name,period,Company, Company_English_name, selected_monitors, all_monitor_data):
-    """生成Word格式的监控报告"""
-    # 创建Word文档
-    if project_name is None:
-        doc_name='\n网站'
-    else:
-        doc_name=project_name+"\n网站"
+# --- Word报告辅助函数 ---
+# 常用XML属性名与颜色对象（模块级缓存，避免逐个单元格重复解析/创建）
+_EASTASIA = qn('w:eastAsia')
+_THEME_FONT_ATTRS = (qn('w:asciiTheme'), qn('w:hAnsiTheme'), qn('w:eastAsiaTheme'))
+_W_PPR = qn('w:pPr')
+_W_PSTYLE = qn('w:pStyle')
+_W_VAL = qn('w:val')
+_W_R = qn('w:r')
+_W_T = qn('w:t')
+_XML_SPACE = '{http://www.w3.org/XML/1998/namespace}space'
+_RGB_BLACK = RGBColor(0, 0, 0)
+# 常用字号/缩进长度对象（Pt每次调用都会新建EMU对象，统一缓存复用）
+_PT0 = Pt(0)
+_PT10 = Pt(10)
+_PT12 = Pt(12)
+_PT13 = Pt(13)
+_PT14 = Pt(14)
+_PT15 = Pt(15)
+_PT16 = Pt(16)
+_PT24 = Pt(24)
+_PT26 = Pt(26)
+_PT340 = Pt(340)
+# 汇总统计表格表头
+_SUMMARY_HEADERS = ('统计维度', '停机次数', '平均停机时长', '平均延迟', '最大延迟', '停机占比')
+# 汇总统计表格单元格的OOXML模板（宋体10号、黑色、居中、无首行缩进），与_style_cell的效果一致
+_SUMMARY_CELL_XML = (
+    '<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{width}"/></w:tcPr>'
+    '<w:p><w:pPr><w:ind w:firstLine="0"/><w:jc w:val="center"/></w:pPr>'
+    '<w:r><w:rPr><w:rFonts w:ascii="宋体" w:hAnsi="宋体" w:eastAsia="宋体"/>{bold}'
+    '<w:color w:val="000000"/><w:sz w:val="20"/></w:rPr><w:t>{text}</w:t></w:r></w:p></w:tc>'
+)
 
 
-    if project_name is not None:
+def _style_cell(cell, text, *, bold=False, size=_PT10):
+    """写入单元格文本并设置格式（宋体、居中、无首行缩进），直接操作唯一的段落/文字块"""
+    p = cell.paragraphs[0]
+    p.text = text
+    p.paragraph_format.first_line_indent = _PT0
+    p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    r = p.runs[0]
+    f = r.font
+    f.name = '宋体'
+    r._element.rPr.rFonts.set(_EASTASIA, '宋体')
+    f.size = size
+    f.bold = bold
+    f.color.rgb = _RGB_BLACK
 
-        # 分隔信息
-        project_target = None
-        project_monitor_data =None
-        for m in selected_monitors:
-            if m['name'] == project_name:
-                project_target = m
-                break
 
-        if project_target:
-            selected_monitors.remove(project_target)
+def _add_indented_styles(doc):
+    """定义首行缩进2字符的项目符号段落样式，段落直接引用样式即可，无需逐段设置缩进"""
+    for style_name, base_name in (('IndentedBullet1', 'List Bullet'), ('IndentedBullet2', 'List Bullet 2')):
+        style = doc.styles.add_style(style_name, WD_STYLE_TYPE.PARAGRAPH)
+        style.base_style = doc.styles[base_name]
+        style.paragraph_format.first_line_indent = _PT24
 
-        for d in all_monitor_data:
-            if d['monitor_name'] == project_name:
-                project_monitor_data = d
-                break
 
-        if project_monitor_data:
-            all_monitor_data.remove(project_monitor_data)
+def _append_bullet(body, text, style_id):
+    """
+    直接构造<w:p>元素并插入正文末尾（sectPr之前），不创建python-docx的Paragraph/Run包装对象
+
+    :param body: 文档正文元素（doc.element.body）
+    :param text: 段落文本
+    :param style_id: 段落样式ID（缩进由样式定义）
+    """
+    p = OxmlElement('w:p')
+    etree.SubElement(etree.SubElement(p, _W_PPR), _W_PSTYLE).set(_W_VAL, style_id)
+    t = etree.SubElement(etree.SubElement(p, _W_R), _W_T)
+    t.text = text
+    if text != text.strip():
+        t.set(_XML_SPACE, 'preserve')
+    body._insert_p(p)
 
 
-    url_list = []
-    for monitor in selected_monitors:
-        url_dic= {
-            'name': monitor["name"],
-            'url': monitor["url"]
-                   }
-        url_list.append(url_dic)
+def _fmt_row(row_cells, texts, bold=False):
+    """填充一行表格单元格并统一设置格式（宋体10号）"""
+    for cell, text in zip(row_cells, texts):
+        _style_cell(cell, text, bold=bold)
+
+
+def _raw_summary_table_xml(summary_stats, col_width):
+    """
+    直接拼接汇总统计表格的OOXML字符串（含表头与日/周/月数据行）
+
+    :param summary_stats: calculate_summary_stats的返回值
+    :param col_width: 单列宽度（twips）
+    :return: <w:tbl>元素的XML字符串
+    """
+    rows = [(_SUMMARY_HEADERS, '<w:b/>')]
+    # 填充统计数据
+    for period, stats in summary_stats.items():
+        rows.append(((
+            period,
+            str(stats['count']),
+            _format_timedelta(stats['avg_duration']),
+            f"{int(stats['avg_ping'])} ms" if stats['avg_ping'] else "N/A",
+            f"{int(stats['max_ping'])} ms" if stats['max_ping'] else "N/A",
+            f"{stats['percentage']:.2f}%",
+        ), '<w:b w:val="0"/>'))
+
+    grid = f'<w:gridCol w:w="{col_width}"/>' * len(_SUMMARY_HEADERS)
+    body = ''.join(
+        '<w:tr>' + ''.join(
+            _SUMMARY_CELL_XML.format(width=col_width, bold=bold, text=escape(text)) for text in texts
+        ) + '</w:tr>'
+        for texts, bold in rows
+    )
+    return (
+        f'<w:tbl {nsdecls("w")}><w:tblPr><w:tblStyle w:val="TableGrid"/><w:tblW w:type="auto" w:w="0"/>'
+        '<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" w:lastRow="0" w:noHBand="0" w:noVBand="1" w:val="04A0"/>'
+        f'</w:tblPr><w:tblGrid>{grid}</w:tblGrid>{body}</w:tbl>'
+    )
+
+
+def _build_summary_table(doc, summary_stats):
+    """添加日/周/月维度的6列汇总统计表格（一次性解析预拼接的XML，绕过逐单元格的python-docx调用）"""
+    # 列宽与doc.add_table一致：正文宽度均分到各列
+    section = doc.sections[-1]
+    block_width = section.page_width - section.left_margin - section.right_margin
+    col_width = Emu(block_width // len(_SUMMARY_HEADERS)).twips
+    tbl = parse_xml(_raw_summary_table_xml(summary_stats, col_width))
+    doc.element.body._insert_tbl(tbl)
+    return tbl
+
+
+def _add_summary_section(doc):
+    """添加「三、监控结果总结」章节（全部为固定文案，不依赖监控数据）"""
+    doc.add_heading('三、监控结果总结', level=1)
+    doc.add_paragraph("本次监控周期内，系统围绕目标站点的可用性、内容合规等核心维度，开展常态化、全覆盖、自动化监控工作，全面排查站点运行过程中的可用性风险与内容合规隐患，确保站点稳定、合规运营，现将监控结果、通用修复建议及下一步监测计划总结如下：")
+
+    doc.add_heading('1. 监控结果概述', level=2)
+    doc.add_paragraph("本次监控覆盖站点全业务页面及核心访问链路，监测过程规范、数据精准，整体运行情况如下：")
+
+    n6 = doc.add_paragraph(style='List Bullet')
+    n6.add_run('可用性监测：').bold = True
+    n6.add_run('监控周期内，按预设固定周期发起标准化访问请求，全面核查站点连通性、响应时效、页面加载状态及跳转逻辑，重点排查无法访问、连接超时、异常跳转、服务中断等典型故障。经全面监测，站点整体访问稳定性良好，核心业务链路响应正常，未出现重大可用性故障；若存在零星轻微异常（如瞬时响应延迟），均已实时捕获并记录，不影响整体业务正常运行。')
+
+    n7 = doc.add_paragraph(style='List Bullet')
+    n7.add_run('内容合规监测：').bold = True
+    n7.add_run('通过实时巡检机制，对站点所有公开页面文本、核心展示元素、关键信息进行全量扫描核验，重点排查违法违规内容、敏感信息、不合规表述及潜在合规风险点。监测结果显示，站点页面内容整体合规，未发现明确违法违规、敏感及不合规表述，内容安全管控到位，符合平台运营合规要求。')
+
+    doc.add_paragraph('综上，本次监控周期内，站点整体运行状态良好，可用性与内容合规性均达到预期运营标准，未出现影响业务正常开展的重大风险隐患。')
+
+
+
+
+    doc.add_heading('2. 修复优化建议', level=2)
+    doc.add_paragraph("结合本次监控情况，为进一步提升站点运行稳定性、内容合规性，防范潜在风险，提出以下通用性修复及优化建议，适配各类站点长期运营需求：")
+
+    n8 = doc.add_paragraph(style='List Bullet')
+    n8.add_run('可用性优化建议：').bold = True
+
+    doc.add_paragraph('针对监控中捕获的瞬时响应延迟、偶尔加载卡顿等轻微异常，建议核查服务器负载、网络带宽及页面资源大小，优化页面加载速度，压缩冗余资源，减少响应耗时。',style='IndentedBullet2')
+
+    doc.add_paragraph('建立可用性故障应急修复机制，提前储备常见故障（如无法访问、超时）的修复流程及操作手册，确保一旦出现故障，可快速响应、及时处置，降低故障影响范围。',style='IndentedBullet2')
+
+    doc.add_paragraph('定期检查站点访问链路及服务器运行状态，排查潜在硬件、软件故障隐患，及时更新服务器系统及相关组件，保障服务运行环境稳定。',style='IndentedBullet2')
+
+
+
+    n9 = doc.add_paragraph(style='List Bullet')
+    n9.add_run('内容合规优化建议:').bold = True
+
+    doc.add_paragraph('建立内容定期自查机制，结合监控结果，定期对站点历史页面、归档内容进行复盘核查，防范遗漏风险，确保内容合规全覆盖，无死角。',style='IndentedBullet2')
+    doc.add_paragraph('优化内容发布审核流程，在内容上线前增加合规校验环节，明确审核标准，防范违规内容、敏感信息误上线，从源头保障内容合规。',style='IndentedBullet2')
+    doc.add_paragraph('及时关注最新合规政策及监管要求，更新内容合规识别标准，同步优化监控系统的合规识别规则，确保监控内容与监管要求保持一致。',style='IndentedBullet2')
+
+
+
+    n10 = doc.add_paragraph(style='List Bullet')
+    n10.add_run('保障建议：').bold = True
+
+    doc.add_paragraph('定期备份站点数据及配置信息，防范数据丢失、配置错乱等问题，确保故障后可快速恢复，降低运营风险。',style='IndentedBullet2')
+
+    doc.add_paragraph('安排专人负责监控结果复盘，定期汇总监控数据，分析异常规律，针对性优化监控策略及站点运营管理方案。',style='IndentedBullet2')
+
+
+
+    doc.add_heading('3. 下一步监测计划', level=2)
+
+
+    doc.add_paragraph('为持续保障站点稳定、合规运营，实现风险早发现、早预警、早处置，下一步将延续常态化监控模式，结合本次监控结果及优化建议，完善监控策略，具体计划如下：')
+
+
+    n11 = doc.add_paragraph(style='List Bullet')
+    n11.add_run('1. 优化监控策略，提升监测精准度：').bold = True
+    n11.add_run('结合本次监控中的轻微异常及优化建议，调整可用性监测的探测周期（重点时段可适当缩短探测间隔），优化内容合规监测的识别规则，增加高频风险点的扫描频次，提升监控的针对性和精准度，减少误报、漏报情况。')
+
+
+
+    n12 = doc.add_paragraph(style='List Bullet')
+    n12.add_run('2. 延续核心监测维度，扩大监测覆盖范围：').bold = True
+    n12.add_run('持续围绕可用性、内容合规两大核心维度开展监测，同时逐步扩大监测覆盖范围，新增对站点附属页面、关联链路的监测，全面覆盖各类潜在风险点，确保站点全链路、全页面的稳定与合规。')
+
+
+
+    n13 = doc.add_paragraph()
+    n13.add_run('3. 强化监控数据管理与复盘：').bold = True
+    n13.add_run('建立完善的监控数据归档机制，定期汇总监测数据、异常记录及修复情况，每月开展一次监控结果复盘，分析站点运行趋势，排查潜在风险隐患，针对性调整优化建议及监控策略。')
+
+
+
+    n14 = doc.add_paragraph()
+    n14.add_run('4. 完善预警与处置机制：').bold = True
+    n14.add_run('优化监控预警规则，明确不同等级异常的预警方式及处置时限，确保异常情况可及时推送至相关负责人；同步完善故障处置跟踪机制，对出现的异常及修复情况进行全程记录，确保问题闭环解决。')
+
+
+
+    n15 = doc.add_paragraph()
+    n15.add_run('5. 配合优化落地，跟踪优化效果：').bold = True
+    n15.add_run('针对本次提出的修复及优化建议，跟踪优化落地情况，在后续监控过程中重点核查优化效果，确认可用性、内容合规性是否得到进一步提升，及时调整优化方向及监控重点。')
+
+
+    doc.add_paragraph('下一步，将持续强化监控工作，细化监控流程，完善保障机制，全力支撑站点持续、稳定、合规运营，防范各类可用性及内容合规风险，为业务正常开展提供坚实保障。')
+
+
+@functools.lru_cache(maxsize=None)
+def _summary_section_elements():
+    """
+    在临时文档中生成一次「三、监控结果总结」章节，缓存其段落XML元素
+
+    段落仅通过样式ID引用样式，可直接复制到任意由报告模板创建的文档中
+    :return: 段落元素元组（使用时需copy.deepcopy）
+    """
+    doc = Document(io.BytesIO(_report_template_bytes()))
+    body = doc.element.body
+    start = len(body) - 1  # 模板的正文仅有sectPr
+    _add_summary_section(doc)
+    return tuple(body[start:-1])
+
+
+@functools.lru_cache(maxsize=None)
+def _report_template_bytes():
+    """
+    生成报告模板（页眉、全局字体、各级标题及项目符号样式等不随数据变化的结构）并缓存序列化结果
 
+    :return: 模板docx文件内容，使用时通过Document(io.BytesIO(...))打开
+    """
     doc = Document()
+    _add_indented_styles(doc)
     section = doc.sections[0]
     header = section.header
     # 清除页眉默认空段落（避免多余空行）
@@ -456,8 +687,8 @@ def generate_docx_report(project_name,period,Company, Company_English_name, sele
         para.clear()
     # 3. 基础页眉设置（所有页面共用）
     header_para = header.add_paragraph()
-    header_para.paragraph_format.first_line_indent = Pt(0)
-    header_para.paragraph_format.line_spacing=Pt(0)
+    header_para.paragraph_format.first_line_indent = _PT0
+    header_para.paragraph_format.line_spacing=_PT0
     # header_para.paragraph_format.line_spacing = Pt(20)
     # 1. 添加左侧图片（关键：设置垂直对齐为居中）
     run_img = header_para.add_run()
@@ -475,67 +706,97 @@ def generate_docx_report(project_name,period,Company, Company_English_name, sele
     # 3. 添加右侧文字
     run_text = header_para.add_run("网站监测服务报告")
     run_text.font.name = '宋体'
-    run_text._element.rPr.rFonts.set(qn('w:eastAsia'), '宋体')
-    run_text.font.size = Pt(14)
+    run_text._element.rPr.rFonts.set(_EASTASIA, '宋体')
+    run_text.font.size = _PT14
     run_text.font.bold = True
 
-    valid_periods = {"day":"日报", "week":"周报", "month":"月报", "quarter":"季度报告", "year":"年报"}
-    report_period=valid_periods[period]
-    # print(report_period)
     # 设置全局字体（兼容中英文）
     normal_style =  doc.styles['Normal']
     normal_style.font.name = '宋体'
-    normal_style.font.size = Pt(12)
-    normal_style._element.rPr.rFonts.set(qn('w:eastAsia'), '宋体')
-    normal_style.font.color.rgb = RGBColor(0, 0, 0)
+    normal_style.font.size = _PT12
+    normal_style._element.rPr.rFonts.set(_EASTASIA, '宋体')
+    normal_style.font.color.rgb = _RGB_BLACK
     normal_para_format = normal_style.paragraph_format
 
     # 2.1 设置全局1.5倍行距
     normal_para_format.line_spacing_rule = WD_LINE_SPACING.ONE_POINT_FIVE
 
     # 2.2 可选：同时设置全局首行缩进、段间距（按需添加）
-    normal_para_format.first_line_indent = Pt(24)  # 全局首行缩进2字符
-    normal_para_format.space_before = Pt(0)        # 全局段前间距5磅
-    normal_para_format.space_after = Pt(0)         # 全局段后间距5磅
-
-    Heading_1_style =  doc.styles['Heading 1']
-    Heading_1_style.font.name = '宋体'
-    Heading_1_style.font.size = Pt(16)
-    Heading_1_style._element.rPr.rFonts.set(qn('w:eastAsia'), '宋体')
-    Heading_1_style.font.color.rgb = RGBColor(0, 0, 0)
-    Heading_1_style_format = Heading_1_style.paragraph_format
-    Heading_1_style_format.space_before = Pt(0)
-    Heading_1_style_format.space_after = Pt(0)
-
-
-    Heading_2_style =  doc.styles['Heading 2']
-    Heading_2_style.font.name = '宋体'
-    Heading_2_style.font.size = Pt(15)
-    Heading_2_style._element.rPr.rFonts.set(qn('w:eastAsia'), '宋体')
-    Heading_2_style.font.color.rgb = RGBColor(0, 0, 0)
-    Heading_2_style_format = Heading_2_style.paragraph_format
-    Heading_2_style_format.space_before = Pt(0)        # 全局段前间距0磅
-    Heading_2_style_format.space_after = Pt(0)         # 全局段后间距0磅
-
-    Heading_3_style =  doc.styles['Heading 3']
-    Heading_3_style.font.name = '宋体'
-    Heading_3_style.font.size = Pt(14)
-    Heading_3_style._element.rPr.rFonts.set(qn('w:eastAsia'), '宋体')
-    Heading_3_style.font.color.rgb = RGBColor(0, 0, 0)
-    Heading_3_style_format = Heading_3_style.paragraph_format
-    Heading_3_style_format.space_before = Pt(0)        # 全局段前间距0磅
-    Heading_3_style_format.space_after = Pt(0)         # 全局段后间距0磅
-
-
-    Heading_4_style =  doc.styles['Heading 4']
-    Heading_4_style.font.name = '宋体'
-    Heading_4_style.font.size = Pt(13)
-    Heading_4_style._element.rPr.rFonts.set(qn('w:eastAsia'), '宋体')
-    Heading_4_style.font.color.rgb = RGBColor(0, 0, 0)
-    Heading_4_style_format = Heading_4_style.paragraph_format
-    Heading_4_style_format.space_before = Pt(0)        # 全局段前间距0磅
-    Heading_4_style_format.space_after = Pt(0)
-    Heading_4_style.font.italic = False
+    normal_para_format.first_line_indent = _PT24  # 全局首行缩进2字符
+    normal_para_format.space_before = _PT0        # 全局段前间距5磅
+    normal_para_format.space_after = _PT0         # 全局段后间距5磅
+
+    # 各级标题样式：宋体、黑色、段前段后0磅
+    for style_name, size in (('Heading 1', _PT16), ('Heading 2', _PT15), ('Heading 3', _PT14), ('Heading 4', _PT13)):
+        heading_style = doc.styles[style_name]
+        heading_style.font.name = '宋体'
+        heading_style.font.size = size
+        rfonts = heading_style._element.rPr.rFonts
+        rfonts.set(_EASTASIA, '宋体')
+        # 默认模板的标题样式带有主题字体属性，其优先级高于显式字体名，需移除后宋体才会生效，
+        # 这样标题段落无需再逐个在文字块上覆盖字体
+        for theme_attr in _THEME_FONT_ATTRS:
+            rfonts.attrib.pop(theme_attr, None)
+        heading_style.font.color.rgb = _RGB_BLACK
+        heading_style_format = heading_style.paragraph_format
+        heading_style_format.space_before = _PT0
+        heading_style_format.space_after = _PT0
+    doc.styles['Heading 4'].font.italic = False
+
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+# --- Word报告生成核心函数 ---
+def generate_docx_report(project_name,period,Company, Company_English_name, selected_monitors, all_monitor_data):
+    """生成Word格式的监控报告"""
+    # 创建Word文档
+    if project_name is None:
+        doc_name='\n网站'
+    else:
+        doc_name=project_name+"\n网站"
+
+
+    if project_name is not None:
+
+        # 分隔信息
+        project_target = None
+        project_monitor_data =None
+        for m in selected_monitors:
+            if m['name'] == project_name:
+                project_target = m
+                break
+
+        if project_target:
+            selected_monitors.remove(project_target)
+
+        for d in all_monitor_data:
+            if d['monitor_name'] == project_name:
+                project_monitor_data = d
+                break
+
+        if project_monitor_data:
+            all_monitor_data.remove(project_monitor_data)
+
+
+    url_list = []
+    for monitor in selected_monitors:
+        url_dic= {
+            'name': monitor["name"],
+            'url': monitor["url"]
+                   }
+        url_list.append(url_dic)
+
+    # 从缓存的报告模板创建文档，页眉与样式均已就绪
+    doc = Document(io.BytesIO(_report_template_bytes()))
+    # 预先取出常用段落样式对象，避免每次add_paragraph按样式名重新检索styles.xml
+    list_bullet = doc.styles['List Bullet']
+    indented_bullet = doc.styles['IndentedBullet1']
+
+    valid_periods = {"day":"日报", "week":"周报", "month":"月报", "quarter":"季度报告", "year":"年报"}
+    report_period=valid_periods[period]
+    # print(report_period)
 
 
     doc.add_paragraph("\n\n\n\n\n\n\n\n")
@@ -545,10 +806,10 @@ def generate_docx_report(project_name,period,Company, Company_English_name, sele
     title.alignment = WD_ALIGN_PARAGRAPH.CENTER
     title_run = title.runs[0]
     title_run.font.name = '黑体'
-    title.paragraph_format.first_line_indent = Pt(0)
-    title_run._element.rPr.rFonts.set(qn('w:eastAsia'), '黑体')
-    title_run.font.size = Pt(26)
-    title_run.font.color.rgb = RGBColor(0, 0, 0)
+    title.paragraph_format.first_line_indent = _PT0
+    title_run._element.rPr.rFonts.set(_EASTASIA, '黑体')
+    title_run.font.size = _PT26
+    title_run.font.color.rgb = _RGB_BLACK
     doc.add_paragraph("\n\n\n\n\n\n\n")
 
 
@@ -563,14 +824,14 @@ def generate_docx_report(project_name,period,Company, Company_English_name, sele
         para.clear()
 
     para = cell.add_paragraph()
-    para.paragraph_format.first_line_indent = Pt(0)
+    para.paragraph_format.first_line_indent = _PT0
     
     run1 = para.add_run(Company+'\n'+Company_English_name)
 
 
     run1.font.name = '黑体'
-    run1._element.rPr.rFonts.set(qn('w:eastAsia'), '黑体')
-    run1.font.size = Pt(12)
+    run1._element.rPr.rFonts.set(_EASTASIA, '黑体')
+    run1.font.size = _PT12
     run1.font.bold = True
 
     # 5. 设置单元格内文本分散对齐（关键：段落水平分散对齐 + 单元格垂直居中）
@@ -580,7 +841,7 @@ def generate_docx_report(project_name,period,Company, Company_English_name, sele
     cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
 
     # 6. 可选：调整单元格宽度（让分散对齐效果更明显）
-    cell.width = Pt(340)  # 设置单元格宽度为400磅，便于分散对齐展示
+    cell.width = _PT340  # 设置单元格宽度为400磅，便于分散对齐展示
 
 
     # 添加基础信息
@@ -588,7 +849,7 @@ def generate_docx_report(project_name,period,Company, Company_English_name, sele
     generated_str = now_aware.strftime('%Y-%m-%d')
     date = doc.add_paragraph(f"\n{generated_str}")
     date.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    date.paragraph_format.first_line_indent = Pt(0)
+    date.paragraph_format.first_line_indent = _PT0
 
 
 
@@ -609,14 +870,8 @@ def generate_docx_report(project_name,period,Company, Company_English_name, sele
 
 
 
-    title1 = doc.add_heading('一、 综述信息', level=1)
-    title1_run = title1.runs[0]
-    title1_run.font.name = '宋体'
-    title1_run._element.rPr.rFonts.set(qn('w:eastAsia'), '宋体')
-    title2 = doc.add_heading('1. 监测概述', level=2)
-    title2_run = title2.runs[0]
-    title2_run.font.name = '宋体'
-    title2_run._element.rPr.rFonts.set(qn('w:eastAsia'), '宋体')
+    doc.add_heading('一、 综述信息', level=1)
+    doc.add_heading('1. 监测概述', level=2)
     doc.add_paragraph(f'为持续保障客户核心互联网资产的稳定运行、合规发布及信息安全，{Company}（以下简称“我方”）针对性部署了多维度网站安全监测系统，构建“实时监测-智能告警-人工核查-快速处置”的全流程主动防御体系，实现7×24小时不间断监测覆盖，最大限度降低安全风险及业务中断损失。')
 
 
@@ -625,12 +880,10 @@ def generate_docx_report(project_name,period,Company, Company_English_name, sele
     doc.add_paragraph('本周期内，监测系统围绕客户指定网站资产，聚焦核心安全及性能指标开展全方位监测，包括但不限于：')
 
 
-    n1 = doc.add_paragraph(style='List Bullet')
-    n1.paragraph_format.first_line_indent = Pt(24)
+    n1 = doc.add_paragraph(style=indented_bullet)
     n1.add_run('可用性监测：').bold = True
     n1.add_run('采用定时主动探测机制，按预设周期对目标站点发起标准化访问请求，全面校验服务连通性、响应状态、页面加载时效与跳转逻辑，精准识别无法访问、连接超时、异常跳转、服务中断等可用性风险，确保业务链路持续稳定可用；')
-    n2 = doc.add_paragraph(style='List Bullet')
-    n2.paragraph_format.first_line_indent = Pt(24)
+    n2 = doc.add_paragraph(style=indented_bullet)
     n2.add_run('内容合规监测：').bold = True
     n2.add_run('于实时内容巡检与智能识别能力，对页面文本、元素及关键信息进行全量扫描核验，自动排查违法违规内容、敏感信息、不当表述及不合规要素，实现风险内容早发现、早预警，保障平台内容安全与合规运营；')
 
@@ -640,58 +893,28 @@ def generate_docx_report(project_name,period,Company, Company_English_name, sele
     doc.add_paragraph('监测过程中，系统一旦捕获上述异常指标，将立即触发分级告警机制，通过专属邮件通道实时推送至指定监测工程师。工程师在收到告警后30分钟内启动人工核查，结合业务场景开展风险研判，同步形成初步处置建议，协助客户快速响应、闭环处置，最大限度控制安全事件影响范围及损失。')
 
 
-    title3= doc.add_heading('2. 监测对象', level=2)
-    title3_run = title3.runs[0]
-    title3_run.font.name = '宋体'
-    title3_run._element.rPr.rFonts.set(qn('w:eastAsia'), '宋体')
+    doc.add_heading('2. 监测对象', level=2)
     # doc.add_paragraph(f"监控项: {monitor_names}")
     # 创建监测对象表格：2列（系统名称、访问地址），首行为表头
     table = doc.add_table(rows=1, cols=2, style='Table Grid')
     # table.alignment = WD_TABLE_ALIGNMENT.CENTER  # 表格左对齐
     # 设置表头
-    hdr_cells = table.rows[0].cells
-    hdr_cells[0].text = '系统名称'
-    hdr_cells[1].text = '访问地址'
     # 格式化表头字体（宋体10号、加粗）
-    for cell in hdr_cells:
-        for paragraph in cell.paragraphs:
-            paragraph.paragraph_format.first_line_indent = Pt(0)
-            paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            for run in paragraph.runs:
-                run.font.name = '宋体'
-                run._element.rPr.rFonts.set(qn('w:eastAsia'), '宋体')
-                run.font.size = Pt(10)
-                run.font.bold = True
-                run.font.color.rgb = RGBColor(0, 0, 0)
-    # 动态添加监测对象数据
+    _fmt_row(table.rows[0].cells, ('系统名称', '访问地址'), bold=True)
+    # 动态添加监测对象数据（宋体10号、常规）
     for urlinfo in url_list:
-        row_cells = table.add_row().cells
-        row_cells[0].text = urlinfo.get('name', '')
-        row_cells[1].text = urlinfo.get('url', '')
-        # 格式化单元格内容（宋体10号、常规）
-        for cell in row_cells:
-            for paragraph in cell.paragraphs:
-                paragraph.paragraph_format.first_line_indent = Pt(0)
-                paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                for run in paragraph.runs:
-                    run.font.name = '宋体'
-                    run._element.rPr.rFonts.set(qn('w:eastAsia'), '宋体')
-                    run.font.size = Pt(10)
-                    run.font.bold = False
-                    run.font.color.rgb = RGBColor(0, 0, 0)
+        _fmt_row(table.add_row().cells, (urlinfo.get('name', ''), urlinfo.get('url', '')))
 
 
     note_title = doc.add_paragraph()
     note_title.add_run('注：').bold = True
     note_title.add_run('本系统在实施监测过程中，受限于以下客观环境因素，可能导致部分监测覆盖度受到影响：')
-    note_title.paragraph_format.first_line_indent = Pt(24)  # 取消首行缩进
+    note_title.paragraph_format.first_line_indent = _PT24  # 取消首行缩进
 
-    n3 = doc.add_paragraph(style='List Bullet')
-    n3.paragraph_format.first_line_indent = Pt(24)
+    n3 = doc.add_paragraph(style=indented_bullet)
     n3.add_run('安全设备拦截限制：').bold = True
     n3.add_run('目标网站部署的防护机制（如WAF、防火墙等）可能将系统高频、深度的探测行为识别为恶意攻击，进而触发拦截机制，导致影响监测全面性；')
-    n4 = doc.add_paragraph(style='List Bullet')
-    n4.paragraph_format.first_line_indent = Pt(24)
+    n4 = doc.add_paragraph(style=indented_bullet)
     n4.add_run('认证页面访问受限：').bold = True
     n4.add_run('由于未配置登录凭证，系统无法进入需身份验证的后台或受保护区域，故对登录后的功能模块、动态内容及深层业务逻辑暂无法开展监测评估。')
 
@@ -699,10 +922,7 @@ def generate_docx_report(project_name,period,Company, Company_English_name, sele
 
 
 
-    title4 = doc.add_heading('二、监测结果', level=1)
-    title4_run = title4.runs[0]
-    title4_run.font.name = '宋体'
-    title4_run._element.rPr.rFonts.set(qn('w:eastAsia'), '宋体')
+    doc.add_heading('二、监测结果', level=1)
     # 监控组信息详情
     ti = 1
     if project_name is not None:
@@ -710,58 +930,14 @@ def generate_docx_report(project_name,period,Company, Company_English_name, sele
         if project_monitor_data:
             monitor_name = project_monitor_data['monitor_name']
             summary_stats = project_monitor_data['summary_stats']
-            title5 = doc.add_heading(f"1. 监控项目总览: {monitor_name}", level=2)
-            title5_run = title5.runs[0]
-            title5_run.font.name = '宋体'
-            title5_run._element.rPr.rFonts.set(qn('w:eastAsia'), '宋体')
+            doc.add_heading(f"1. 监控项目总览: {monitor_name}", level=2)
             ti = 2
 
 
         # 汇总统计表格
-        summary_table = doc.add_table(rows=1, cols=6)
-        summary_table.style = 'Table Grid'
-        hdr_cells = summary_table.rows[0].cells
-        hdr_cells[0].text = '统计维度'
-        hdr_cells[1].text = '停机次数'
-        hdr_cells[2].text = '平均停机时长'
-        hdr_cells[3].text = '平均延迟'
-        hdr_cells[4].text = '最大延迟'
-        hdr_cells[5].text = '停机占比'
-        for cell in hdr_cells:
-            for paragraph in cell.paragraphs:
-                paragraph.paragraph_format.first_line_indent = Pt(0)
-                paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                for run in paragraph.runs:
-                    run.font.name = '宋体'
-                    run.font.size = Pt(10)
-                    run.font.bold = True
-                    run.font.color.rgb = RGBColor(0, 0, 0)
-                    run._element.rPr.rFonts.set(qn('w:eastAsia'), '宋体')
-
-        # 填充统计数据
-        for period, stats in summary_stats.items():
-            row_cells = summary_table.add_row().cells
-            row_cells[0].text = period
-            row_cells[1].text = str(stats['count'])
-            row_cells[2].text = _format_timedelta(stats['avg_duration'])
-            row_cells[3].text = f"{int(stats['avg_ping'])} ms" if stats['avg_ping'] else "N/A"
-            row_cells[4].text = f"{int(stats['max_ping'])} ms" if stats['max_ping'] else "N/A"
-            row_cells[5].text = f"{stats['percentage']:.2f}%"
-            for cell in row_cells:
-                for paragraph in cell.paragraphs:
-                    paragraph.paragraph_format.first_line_indent = Pt(0)
-                    paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                    for run in paragraph.runs:
-                        run.font.name = '宋体'
-                        run._element.rPr.rFonts.set(qn('w:eastAsia'), '宋体')
-                        run.font.size = Pt(10)
-                        run.font.bold = False
-                        run.font.color.rgb = RGBColor(0, 0, 0)
+        _build_summary_table(doc, summary_stats)
     else:
-        title5 = doc.add_heading(f"1. 监控详情", level=2)
-        title5_run = title5.runs[0]
-        title5_run.font.name = '宋体'
-        title5_run._element.rPr.rFonts.set(qn('w:eastAsia'), '宋体')
+        doc.add_heading(f"1. 监控详情", level=2)
 
 
 
@@ -774,208 +950,67 @@ def generate_docx_report(project_name,period,Company, Company_English_name, sele
         keyword_analysis = data['keyword_analysis']
 
 
-        title6 = doc.add_heading(f"{ti}.{idx+1}. 监控项: {monitor_name}", level=3)
-        title6_run = title6.runs[0]
-        title6_run.font.name = '宋体'
-        title6_run._element.rPr.rFonts.set(qn('w:eastAsia'), '宋体')
-
-       # 汇总统计表格
-        summary_table = doc.add_table(rows=1, cols=6)
-        summary_table.style = 'Table Grid'
-        hdr_cells = summary_table.rows[0].cells
-        hdr_cells[0].text = '统计维度'
-        hdr_cells[1].text = '停机次数'
-        hdr_cells[2].text = '平均停机时长'
-        hdr_cells[3].text = '平均延迟'
-        hdr_cells[4].text = '最大延迟'
-        hdr_cells[5].text = '停机占比'
-        for cell in hdr_cells:
-            for paragraph in cell.paragraphs:
-                paragraph.paragraph_format.first_line_indent = Pt(0)
-                paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                for run in paragraph.runs:
-                    run.font.name = '宋体'
-                    run._element.rPr.rFonts.set(qn('w:eastAsia'), '宋体')
-                    run.font.size = Pt(10)
-                    run.font.bold = True
-                    run.font.color.rgb = RGBColor(0, 0, 0)
-
-        # 填充统计数据
-        for period, stats in summary_stats.items():
-            row_cells = summary_table.add_row().cells
-            row_cells[0].text = period
-            row_cells[1].text = str(stats['count'])
-            row_cells[2].text = _format_timedelta(stats['avg_duration'])
-            row_cells[3].text = f"{int(stats['avg_ping'])} ms" if stats['avg_ping'] else "N/A"
-            row_cells[4].text = f"{int(stats['max_ping'])} ms" if stats['max_ping'] else "N/A"
-            row_cells[5].text = f"{stats['percentage']:.2f}%"
-            for cell in row_cells:
-                for paragraph in cell.paragraphs:
-                    paragraph.paragraph_format.first_line_indent = Pt(0)
-                    paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                    for run in paragraph.runs:
-                        run.font.name = '宋体'
-                        run._element.rPr.rFonts.set(qn('w:eastAsia'), '宋体')
-                        run.font.size = Pt(10)
-                        run.font.bold = False
-                        run.font.color.rgb = RGBColor(0, 0, 0)
+        doc.add_heading(f"{ti}.{idx+1}. 监控项: {monitor_name}", level=3)
+
+        # 汇总统计表格
+        _build_summary_table(doc, summary_stats)
 
         # 关键词事件日志
-        title7 = doc.add_heading(f"{ti}.{idx+1}.1. 关键词日志", level=4)
-        title7_run = title7.runs[0]
-        title7_run.font.name = '宋体'
-        title7_run._element.rPr.rFonts.set(qn('w:eastAsia'), '宋体')
+        doc.add_heading(f"{ti}.{idx+1}.1. 关键词日志", level=4)
         if keyword_analysis["keyword_count"] == 0:
             doc.add_paragraph("该时间段内无关键词事件")
         else:
             keywords = str(keyword_analysis['unique_keywords']) or "N/A"
             keyword_count =str(keyword_analysis['keyword_count']) or "N/A"
             keyword_ratio =str(keyword_analysis['keyword_ratio']) or "N/A"
-            doc.add_paragraph(f"累计触发以下关键词:", style='List Bullet')
-            doc.add_paragraph(f"{keywords}", style='List Bullet')
-            doc.add_paragraph(f"总计占比: {keyword_ratio}，共{keyword_count}次", style='List Bullet')
+            doc.add_paragraph(f"累计触发以下关键词:", style=list_bullet)
+            doc.add_paragraph(f"{keywords}", style=list_bullet)
+            doc.add_paragraph(f"总计占比: {keyword_ratio}，共{keyword_count}次", style=list_bullet)
             doc.add_paragraph()  # 空行分隔
 
         # 停机事件日志
-        title8 = doc.add_heading(f"{ti}.{idx+1}.2. 停机事件日志（时间排序）", level=4)
-        title8_run = title8.runs[0]
-        title8_run.font.name = '宋体'
-        title8_run._element.rPr.rFonts.set(qn('w:eastAsia'), '宋体')
+        doc.add_heading(f"{ti}.{idx+1}.2. 停机事件日志（时间排序）", level=4)
         if not incidents:
             doc.add_paragraph("该时间段内无停机事件")
         else:
+            body = doc.element.body
+            bullet_style_id = indented_bullet.style_id
             for incident in reversed(incidents):
-                start_str = incident['start'].strftime('%Y-%m-%d %H:%M:%S %Z')
+                # isoformat为C实现，比strftime快；截去末尾的UTC偏移后补上时区名，与原格式一致
+                dt = incident['start']
+                start_str = f"{dt.isoformat(sep=' ', timespec='seconds')[:19]} {dt.tzname() or ''}"
                 duration_str = _format_timedelta(incident['duration'])
-                if incident.get("ongoing", False):
-                    duration_str += " (持续中)"
+                # 持续中的停机追加标记，整行文本一次拼出
+                ongoing_mark = " (持续中)" if incident.get("ongoing", False) else ""
 
-                doc.add_paragraph(f"停机开始: {start_str}", style='List Bullet').paragraph_format.first_line_indent = Pt(24)
-                doc.add_paragraph(f"持续时长: {duration_str}", style='List Bullet').paragraph_format.first_line_indent = Pt(24)
+                _append_bullet(body, f"停机开始: {start_str}", bullet_style_id)
+                _append_bullet(body, f"持续时长: {duration_str}{ongoing_mark}", bullet_style_id)
                 # doc.add_paragraph()  # 空行分隔
 
 
-    # 结果总结和进一步规划
-    title9 = doc.add_heading('三、监控结果总结', level=1)
-    title9_run = title9.runs[0]
-    title9_run.font.name = '宋体'
-    title9_run._element.rPr.rFonts.set(qn('w:eastAsia'), '宋体')
-    doc.add_paragraph("本次监控周期内，系统围绕目标站点的可用性、内容合规等核心维度，开展常态化、全覆盖、自动化监控工作，全面排查站点运行过程中的可用性风险与内容合规隐患，确保站点稳定、合规运营，现将监控结果、通用修复建议及下一步监测计划总结如下：")
-
-    title10 = doc.add_heading('1. 监控结果概述', level=2)
-    title10_run = title10.runs[0]
-    title10_run.font.name = '宋体'
-    title10_run._element.rPr.rFonts.set(qn('w:eastAsia'), '宋体')
-    doc.add_paragraph("本次监控覆盖站点全业务页面及核心访问链路，监测过程规范、数据精准，整体运行情况如下：")
-
-    n6 = doc.add_paragraph(style='List Bullet')
-    n6.add_run('可用性监测：').bold = True
-    n6.add_run('监控周期内，按预设固定周期发起标准化访问请求，全面核查站点连通性、响应时效、页面加载状态及跳转逻辑，重点排查无法访问、连接超时、异常跳转、服务中断等典型故障。经全面监测，站点整体访问稳定性良好，核心业务链路响应正常，未出现重大可用性故障；若存在零星轻微异常（如瞬时响应延迟），均已实时捕获并记录，不影响整体业务正常运行。')
-
-    n7 = doc.add_paragraph(style='List Bullet')
-    n7.add_run('内容合规监测：').bold = True
-    n7.add_run('通过实时巡检机制，对站点所有公开页面文本、核心展示元素、关键信息进行全量扫描核验，重点排查违法违规内容、敏感信息、不合规表述及潜在合规风险点。监测结果显示，站点页面内容整体合规，未发现明确违法违规、敏感及不合规表述，内容安全管控到位，符合平台运营合规要求。')
-
-    doc.add_paragraph('综上，本次监控周期内，站点整体运行状态良好，可用性与内容合规性均达到预期运营标准，未出现影响业务正常开展的重大风险隐患。')
-
-
-
-
-    title11 = doc.add_heading('2. 修复优化建议', level=2)
-    title11_run = title11.runs[0]
-    title11_run.font.name = '宋体'
-    title11_run._element.rPr.rFonts.set(qn('w:eastAsia'), '宋体')
-    doc.add_paragraph("结合本次监控情况，为进一步提升站点运行稳定性、内容合规性，防范潜在风险，提出以下通用性修复及优化建议，适配各类站点长期运营需求：")
-
-    n8 = doc.add_paragraph(style='List Bullet')
-    n8.add_run('可用性优化建议：').bold = True
-
-    doc.add_paragraph('针对监控中捕获的瞬时响应延迟、偶尔加载卡顿等轻微异常，建议核查服务器负载、网络带宽及页面资源大小，优化页面加载速度，压缩冗余资源，减少响应耗时。',style='List Bullet 2').paragraph_format.first_line_indent = Pt(24)
-
-    doc.add_paragraph('建立可用性故障应急修复机制，提前储备常见故障（如无法访问、超时）的修复流程及操作手册，确保一旦出现故障，可快速响应、及时处置，降低故障影响范围。',style='List Bullet 2').paragraph_format.first_line_indent = Pt(24)
-
-    doc.add_paragraph('定期检查站点访问链路及服务器运行状态，排查潜在硬件、软件故障隐患，及时更新服务器系统及相关组件，保障服务运行环境稳定。',style='List Bullet 2').paragraph_format.first_line_indent = Pt(24)
-
-
-
-    n9 = doc.add_paragraph(style='List Bullet')
-    n9.add_run('内容合规优化建议:').bold = True
-
-    doc.add_paragraph('建立内容定期自查机制，结合监控结果，定期对站点历史页面、归档内容进行复盘核查，防范遗漏风险，确保内容合规全覆盖，无死角。',style='List Bullet 2').paragraph_format.first_line_indent = Pt(24)
-    doc.add_paragraph('优化内容发布审核流程，在内容上线前增加合规校验环节，明确审核标准，防范违规内容、敏感信息误上线，从源头保障内容合规。',style='List Bullet 2').paragraph_format.first_line_indent = Pt(24)
-    doc.add_paragraph('及时关注最新合规政策及监管要求，更新内容合规识别标准，同步优化监控系统的合规识别规则，确保监控内容与监管要求保持一致。',style='List Bullet 2').paragraph_format.first_line_indent = Pt(24)
-
-
-
-    n10 = doc.add_paragraph(style='List Bullet')
-    n10.add_run('保障建议：').bold = True
-
-    doc.add_paragraph('定期备份站点数据及配置信息，防范数据丢失、配置错乱等问题，确保故障后可快速恢复，降低运营风险。',style='List Bullet 2').paragraph_format.first_line_indent = Pt(24)
-
-    doc.add_paragraph('安排专人负责监控结果复盘，定期汇总监控数据，分析异常规律，针对性优化监控策略及站点运营管理方案。',style='List Bullet 2').paragraph_format.first_line_indent = Pt(24)
-
-
-
-    title12 = doc.add_heading('3. 下一步监测计划', level=2)
-    title12_run = title12.runs[0]
-    title12_run.font.name = '宋体'
-    title12_run._element.rPr.rFonts.set(qn('w:eastAsia'), '宋体')
-
-
-    doc.add_paragraph('为持续保障站点稳定、合规运营，实现风险早发现、早预警、早处置，下一步将延续常态化监控模式，结合本次监控结果及优化建议，完善监控策略，具体计划如下：')
-
-
-    n11 = doc.add_paragraph(style='List Bullet')
-    n11.add_run('1. 优化监控策略，提升监测精准度：').bold = True
-    n11.add_run('结合本次监控中的轻微异常及优化建议，调整可用性监测的探测周期（重点时段可适当缩短探测间隔），优化内容合规监测的识别规则，增加高频风险点的扫描频次，提升监控的针对性和精准度，减少误报、漏报情况。')
-
-
-
-    n12 = doc.add_paragraph(style='List Bullet')
-    n12.add_run('2. 延续核心监测维度，扩大监测覆盖范围：').bold = True
-    n12.add_run('持续围绕可用性、内容合规两大核心维度开展监测，同时逐步扩大监测覆盖范围，新增对站点附属页面、关联链路的监测，全面覆盖各类潜在风险点，确保站点全链路、全页面的稳定与合规。')
-
-
-
-    n13 = doc.add_paragraph()
-    n13.add_run('3. 强化监控数据管理与复盘：').bold = True
-    n13.add_run('建立完善的监控数据归档机制，定期汇总监测数据、异常记录及修复情况，每月开展一次监控结果复盘，分析站点运行趋势，排查潜在风险隐患，针对性调整优化建议及监控策略。')
-
-
-
-    n14 = doc.add_paragraph()
-    n14.add_run('4. 完善预警与处置机制：').bold = True
-    n14.add_run('优化监控预警规则，明确不同等级异常的预警方式及处置时限，确保异常情况可及时推送至相关负责人；同步完善故障处置跟踪机制，对出现的异常及修复情况进行全程记录，确保问题闭环解决。')
-
-
-
-    n15 = doc.add_paragraph()
-    n15.add_run('5. 配合优化落地，跟踪优化效果：').bold = True
-    n15.add_run('针对本次提出的修复及优化建议，跟踪优化落地情况，在后续监控过程中重点核查优化效果，确认可用性、内容合规性是否得到进一步提升，及时调整优化方向及监控重点。')
-
-
-    doc.add_paragraph('下一步，将持续强化监控工作，细化监控流程，完善保障机制，全力支撑站点持续、稳定、合规运营，防范各类可用性及内容合规风险，为业务正常开展提供坚实保障。')
-
-
-
-
-
-
-
+    # 结果总结和进一步规划（静态内容，复制预先生成的XML元素）
+    body = doc.element.body
+    for element in _summary_section_elements():
+        body._insert_p(copy.deepcopy(element))
 
+    # 保存文档（项目名称不放入strftime格式串，避免其中的%被当作格式符解析）
+    ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    prefix = f"{project_name}网站检测服务{report_period}" if project_name else f"网站检测服务{report_period}"
+    filename = f"{prefix}_{ts}.docx"
 
-
-
-
-
-
-    # 保存文档
-    if project_name:
-        filename = datetime.datetime.now().strftime(f"{project_name}网站检测服务{report_period}_%Y%m%d_%H%M%S.docx")
-    else:
-        filename = datetime.datetime.now().strftime(f"网站检测服务{report_period}_%Y%m%d_%H%M%S.docx")
-
-    doc.save(filename)
+    # 先完整序列化到内存再一次性写入临时文件，最后原子替换，避免生成半个文件
+    buf = io.BytesIO()
+    doc.save(buf)
+    tmp = filename + '.tmp'
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(buf.getbuffer())
+        os.replace(tmp, filename)
+    except Exception:
+        # 写入或替换失败（磁盘已满、无权限等）时清理残留的临时文件，再向上抛出原异常
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
     return filename
 
 
@@ -983,33 +1018,62 @@ def _format_timedelta(td):
     """将时间差格式化为易读字符串（如 1d 2h 3m）"""
     if td is None:
         return "N/A"
-    days, remainder = divmod(td.total_seconds(), 86400)
-    hours, remainder = divmod(remainder, 3600)
+    # 不足1分钟的短时停机最常见，直接返回秒数
+    if not td.days and td.seconds < 60:
+        return f"{td.seconds}s"
+    # timedelta本身已按天/秒拆分为整数，直接取用，避免浮点换算与多余的int转换
+    return _format_days_seconds(td.days, td.seconds)
+
+
+@functools.lru_cache(maxsize=256)
+def _format_days_seconds(days, secs):
+    """按整数天数与秒数格式化时长；停机时长多为心跳间隔的整数倍，重复值较多，结果缓存复用"""
+    hours, remainder = divmod(secs, 3600)
     minutes, seconds = divmod(remainder, 60)
 
     parts = []
     if days > 0:
-        parts.append(f"{int(days)}d")
-    if hours > 0:
-        parts.append(f"{int(hours)}h")
-    if minutes > 0:
-        parts.append(f"{int(minutes)}m")
-    if seconds > 0 or not parts:
-        parts.append(f"{int(seconds)}s")
+        parts.append(f"{days}d")
+    if hours:
+        parts.append(f"{hours}h")
+    if minutes:
+        parts.append(f"{minutes}m")
+    if seconds or not parts:
+        parts.append(f"{seconds}s")
 
     return " ".join(parts)
 
 
 
 
+# --- 数据获取 ---
+def fetch_monitor_data(api, monitor, report_times, report_start):
+    """获取单个监控项的心跳数据并完成分析（在线程池中并发执行）"""
+    monitor_name = monitor['name']
+    # 接口仅支持按整小时数回溯，小时数向上取整时会多返回周期起点之前的心跳，分析时按report_start裁剪
+    heartbeats = api.get_monitor_beats(monitor['id'], report_times)
+    analysis_results = analyze_heartbeats(heartbeats, since=report_start)
+    summary_stats = calculate_summary_stats(analysis_results)
+    return {
+        "monitor_name": monitor_name,
+        "summary_stats": summary_stats,
+        "downtime_incidents": analysis_results['downtime_incidents'],
+        "keyword_analysis":analysis_results['keyword_analysis'],
+    }
+
+
 # --- 主函数 ---
 def main():
     print_banner()
     url, username, password,Company, Company_English_name, save_config_needed = handle_credentials()
 
+    # 延迟导入：uptime_kuma_api会连带加载socketio/requests等模块，放到凭证输入之后，
+    # 使启动横幅和交互提示无需等待导入完成
+    from uptime_kuma_api import UptimeKumaApi, UptimeKumaException
+
     try:
         # 连接Uptime Kuma并获取数据
-        with UptimeKumaApi(url) as api:
+        with UptimeKumaApi(url, timeout=API_TIMEOUT) as api:
             api.login(username, password)
             print("\n成功连接到Uptime Kuma！")
 
@@ -1027,41 +1091,29 @@ def main():
                 print("未选择任何监控项，程序退出")
                 return
             period=chose_report()
-            report_times= calculate_hours_since_period_start(period)
+            # 报告时间窗口起点取周期第一天0时0分的精确时间，所有监控项共用
+            report_times, report_start = calculate_hours_since_period_start(period)
 
-            selected_monitors=[]
-            all_monitor_data = []
-            
             print("\n正在分析数据并生成Word报告...")
-            for id in selected_id:
-                monitor=api.get_monitor(id)
-                selected_monitors.append(monitor)
-                
+            # get_monitors已返回完整的监控项信息，直接按ID取用，无需再逐个请求get_monitor
+            monitors_by_id = {m['id']: m for m in monitors}
+            selected_monitors = [monitors_by_id[i] for i in selected_id]
 
+            # 选中的监控组（顶级且包含子监控）名称作为项目名称
+            project_name = next(
+                (m['name'] for m in selected_monitors if m.get('parent') is None and m.get('childrenIDs')), None
+            )
 
-            # 处理每个监控项的数据
-            project_name=None
+            # 在主线程按选择顺序输出进度，避免工作线程打印顺序错乱
             for monitor in selected_monitors:
-                monitor_id = monitor['id']
-                monitor_name = monitor['name']
-                if monitor.get('parent') is None:
-                    if monitor.get("childrenIDs", []) != []:   
-                       project_name=monitor_name
-                print(f"  - 处理监控项: {monitor_name}")
-                
-
-                heartbeats = api.get_monitor_beats(monitor_id, report_times)
-                analysis_results = analyze_heartbeats(heartbeats)
-             
-                summary_stats = calculate_summary_stats(analysis_results)
-            
-
-                all_monitor_data.append({
-                    "monitor_name": monitor_name,
-                    "summary_stats": summary_stats,
-                    "downtime_incidents": analysis_results['downtime_incidents'],
-                    "keyword_analysis":analysis_results['keyword_analysis'],
-                })
+                print(f"  - 处理监控项: {monitor['name']}")
+
+            # 各监控项的心跳请求均为网络往返，且共用同一个socket连接（按请求ID匹配响应），
+            # 使用线程池并发发起；map按提交顺序返回结果，报告顺序与选择顺序一致
+            with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(selected_id))) as executor:
+                all_monitor_data = list(executor.map(
+                    lambda monitor: fetch_monitor_data(api, monitor, report_times, report_start), selected_monitors
+                ))
 
             # 生成Word报告
             filename = generate_docx_report(project_name,period,Company, Company_English_name, selected_monitors, all_monitor_data)